@@ -0,0 +1,65 @@
+import boto3
+import httpx
+import orjson
+import streamlit as st
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+
+REGION = "us-east-1"
+SERVICE = "bedrock"
+
+# The client is created per batch rather than cached process-wide: its
+# connections are bound to the event loop they were opened on, and each
+# asyncio.run() in Streamlit uses a fresh loop, so a cached client would
+# fail with "Event loop is closed" on the second run. HTTP/2 still
+# multiplexes all calls within a batch over one TLS handshake.
+def new_async_client() -> httpx.AsyncClient:
+    """
+    Create an async HTTP client for a batch of Bedrock calls.
+    Callers should use it as an async context manager so its connections
+    open and close on the event loop running the batch.
+    Returns:
+        httpx.AsyncClient: HTTP/2 client with a bounded connection pool
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64),
+        timeout=httpx.Timeout(300.0),
+    )
+
+@st.cache_resource
+def get_credentials():
+    """
+    Resolve and cache the AWS credentials used for request signing.
+    Returns:
+        botocore.credentials.Credentials: The resolved credentials
+    """
+    return boto3.Session().get_credentials()
+
+async def invoke_model_async(client: httpx.AsyncClient, model_id: str, body: bytes) -> dict:
+    """
+    Invoke a Bedrock model through a SigV4-signed async HTTP request.
+    Unlike boto3's blocking invoke_model, this stays on the event loop,
+    so callers can fan out with asyncio.gather without a thread pool.
+    Args:
+        client (httpx.AsyncClient): Client from new_async_client(), owned
+            by the event loop running the call
+        model_id (str): The Bedrock model ID to invoke
+        body (bytes): JSON encoded request body
+    Returns:
+        dict: The decoded JSON response body
+    Raises:
+        httpx.HTTPStatusError: If Bedrock returns an error status
+    """
+    url = f"https://bedrock-runtime.{REGION}.amazonaws.com/model/{model_id}/invoke"
+    request = AWSRequest(
+        method="POST",
+        url=url,
+        data=body,
+        headers={"Content-Type": "application/json"},
+    )
+    SigV4Auth(get_credentials(), SERVICE, REGION).add_auth(request)
+
+    response = await client.post(url, headers=dict(request.headers), content=body)
+    response.raise_for_status()
+    return orjson.loads(response.content)
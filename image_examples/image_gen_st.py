@@ -1,11 +1,17 @@
-import json
-import base64
+import asyncio
+import os
 from io import BytesIO
 import boto3
+import httpx
+import orjson
+import pybase64
 import streamlit as st
-from typing import Optional
+from typing import List, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from bedrock_http import invoke_model_async, new_async_client
+
 # Cache the Bedrock client to avoid recreating it on every rerun
 @st.cache_resource
 def get_bedrock_client(region: str = "us-east-1") -> boto3.client:
@@ -18,12 +24,32 @@ def get_bedrock_client(region: str = "us-east-1") -> boto3.client:
     """
     return boto3.client(
         service_name="bedrock-runtime",
-        region_name=region
+        region_name=region,
+        config=Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 3},
+        ),
     )
 
+# Module-level client reference: steady-state calls do one attribute load
+# instead of taking Streamlit's cache lock on every invocation
+_CLIENT = None
+
+def _bedrock():
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = get_bedrock_client()
+    return _CLIENT
+
+# Decode chunk size in base64 characters; must be a multiple of 4
+B64_CHUNK_SIZE = 64 * 1024
+
 def base64_to_image(base64_string: str) -> BytesIO:
     """
-    Convert a base64 string to an image that can be displayed in Streamlit
+    Convert a base64 string to an image that can be displayed in Streamlit.
+    The string is decoded in chunks straight into the output buffer, so
+    no second full-size bytes object is allocated alongside the result.
     Args:
         base64_string (str): The base64 encoded image
     Returns:
@@ -32,19 +58,23 @@ def base64_to_image(base64_string: str) -> BytesIO:
         ValueError: If the base64 string is invalid
     """
     try:
-        return BytesIO(base64.b64decode(base64_string))
+        buffer = BytesIO()
+        for i in range(0, len(base64_string), B64_CHUNK_SIZE):
+            buffer.write(pybase64.b64decode(base64_string[i:i + B64_CHUNK_SIZE], validate=False))
+        buffer.seek(0)
+        return buffer
     except Exception as e:
         raise ValueError(f"Failed to decode base64 string: {str(e)}")
 
-def generate_image_nova(
+def build_nova_body(
     text: str,
     height: int = 1024,
     width: int = 1024,
     cfg_scale: float = 8.0,
     seed: int = 0
-) -> Optional[str]:
+) -> bytes:
     """
-    Generate an image using Amazon Nova Canvas model on demand.
+    Build the JSON request body for the Nova Canvas model.
     Args:
         text (str): The prompt text for image generation
         height (int): Height of the generated image
@@ -52,13 +82,9 @@ def generate_image_nova(
         cfg_scale (float): Configuration scale parameter
         seed (int): Random seed for generation
     Returns:
-        Optional[str]: Base64 encoded image or None if generation fails
+        bytes: JSON encoded request body
     """
-    model_id = "amazon.nova-canvas-v1:0"
-    accept = "application/json"
-    content_type = "application/json"
-
-    body = json.dumps({
+    return orjson.dumps({
         "taskType": "TEXT_IMAGE",
         "textToImageParams": {"text": text},
         "imageGenerationConfig": {
@@ -70,16 +96,48 @@ def generate_image_nova(
         },
     })
 
+# The body carries a fixed seed, so identical parameters always yield the
+# same image; caching skips the paid Bedrock round-trip on Streamlit reruns.
+# Errors raise through and are never cached.
+@st.cache_data(ttl=3600, show_spinner=False)
+def invoke_nova(body: bytes) -> str:
+    """
+    Invoke the Nova Canvas model with a prepared request body.
+    Args:
+        body (bytes): JSON encoded request body
+    Returns:
+        str: Base64 encoded image
+    """
+    bedrock_runtime = _bedrock()
+    response = bedrock_runtime.invoke_model(
+        body=body,
+        modelId="amazon.nova-canvas-v1:0",
+        accept="application/json",
+        contentType="application/json"
+    )
+    response_body = orjson.loads(response.get("body").read())
+    return response_body.get("images")[0]
+
+def generate_image_nova(
+    text: str,
+    height: int = 1024,
+    width: int = 1024,
+    cfg_scale: float = 8.0,
+    seed: int = 0
+) -> Optional[str]:
+    """
+    Generate an image using Amazon Nova Canvas model on demand.
+    Args:
+        text (str): The prompt text for image generation
+        height (int): Height of the generated image
+        width (int): Width of the generated image
+        cfg_scale (float): Configuration scale parameter
+        seed (int): Random seed for generation
+    Returns:
+        Optional[str]: Base64 encoded image or None if generation fails
+    """
     try:
-        bedrock_runtime = get_bedrock_client()
-        response = bedrock_runtime.invoke_model(
-            body=body,
-            modelId=model_id,
-            accept=accept,
-            contentType=content_type
-        )
-        response_body = json.loads(response.get("body").read())
-        return response_body.get("images")[0]
+        return invoke_nova(build_nova_body(text, height, width, cfg_scale, seed))
     except ClientError as e:
         st.error(f"AWS API Error: {str(e)}")
         return None
@@ -87,6 +145,78 @@ def generate_image_nova(
         st.error(f"Unexpected error: {str(e)}")
         return None
 
+async def generate_images_nova_batch(
+    prompts: List[str],
+    height: int = 1024,
+    width: int = 1024,
+    cfg_scale: float = 8.0,
+    seed: int = 0,
+    max_parallel_requests: Optional[int] = None
+) -> List[Optional[str]]:
+    """
+    Generate one image per prompt, invoking Bedrock concurrently.
+    The calls are I/O-bound (network round-trip dominates), so they are
+    dispatched with asyncio.gather over the shared async HTTP client
+    instead of waiting N x single-call latency.
+    Args:
+        prompts (List[str]): One prompt per image to generate
+        height (int): Height of the generated images
+        width (int): Width of the generated images
+        cfg_scale (float): Configuration scale parameter
+        seed (int): Random seed for generation
+        max_parallel_requests (Optional[int]): Upper bound on concurrent
+            Bedrock calls; defaults to min(len(prompts), cpu_count * 5)
+    Returns:
+        List[Optional[str]]: Base64 encoded images, None where a prompt failed
+    """
+    if max_parallel_requests is None:
+        max_parallel_requests = min(len(prompts), (os.cpu_count() or 1) * 5)
+
+    bodies = [
+        build_nova_body(text, height, width, cfg_scale, seed)
+        for text in prompts
+    ]
+
+    # Streamlit reruns re-submit identical prompt/params, and the body
+    # carries a fixed seed, so consult a body-keyed memo before paying
+    # for a Bedrock call; only the misses fan out
+    cache = st.session_state.setdefault("nova_image_cache", {})
+    misses = [body for body in dict.fromkeys(bodies) if body not in cache]
+
+    semaphore = asyncio.Semaphore(max_parallel_requests)
+
+    async def generate_one(client, body: bytes) -> str:
+        async with semaphore:
+            response_body = await invoke_model_async(client, "amazon.nova-canvas-v1:0", body)
+            return response_body.get("images")[0]
+
+    miss_results = {}
+    if misses:
+        # The client lives exactly as long as the loop running this batch,
+        # so no connection outlives the asyncio.run() that owns it
+        async with new_async_client() as client:
+            results = await asyncio.gather(
+                *(generate_one(client, body) for body in misses),
+                return_exceptions=True
+            )
+        miss_results = dict(zip(misses, results))
+        for body, result in miss_results.items():
+            if not isinstance(result, Exception):
+                cache[body] = result
+
+    images: List[Optional[str]] = []
+    for text, body in zip(prompts, bodies):
+        if body in cache:
+            images.append(cache[body])
+            continue
+        result = miss_results[body]
+        if isinstance(result, httpx.HTTPStatusError):
+            st.error(f"AWS API Error for '{text[:50]}': {str(result)}")
+        else:
+            st.error(f"Unexpected error for '{text[:50]}': {str(result)}")
+        images.append(None)
+    return images
+
 def main():
     st.set_page_config(
         page_title="Building with Bedrock",
@@ -108,9 +238,9 @@ def main():
             key="model_selection"
         )
 
-        # Text input for the prompt
+        # Text input for the prompts, one per line
         user_prompt = st.text_area(
-            "Enter your image generation prompt:",
+            "Enter your image generation prompts (one per line):",
             value="A beautiful sunset over mountains",
             height=100,
             key="prompt_input"
@@ -132,6 +262,14 @@ def main():
                 step=0.5,
                 key="cfg_scale"
             )
+            max_parallel_requests = st.slider(
+                "Max Parallel Requests",
+                min_value=1,
+                max_value=10,
+                value=5,
+                key="max_parallel_requests",
+                help="Upper bound on concurrent Bedrock calls for multi-prompt generation"
+            )
 
         # Button to generate image
         generate_button = st.button(
@@ -142,32 +280,36 @@ def main():
 
     with col2:
         if generate_button:
-            if not user_prompt.strip():
+            prompts = [line.strip() for line in user_prompt.splitlines() if line.strip()]
+            if not prompts:
                 st.warning("Please enter a prompt first.")
             else:
                 with st.spinner("🎨 Generating your masterpiece..."):
-                    base64_image = generate_image_nova(
-                        text=user_prompt,
+                    base64_images = asyncio.run(generate_images_nova_batch(
+                        prompts,
                         height=image_size,
                         width=image_size,
-                        cfg_scale=cfg_scale
-                    )
-                    
+                        cfg_scale=cfg_scale,
+                        max_parallel_requests=max_parallel_requests
+                    ))
+
+                for i, (prompt, base64_image) in enumerate(zip(prompts, base64_images)):
                     if base64_image:
                         try:
                             image = base64_to_image(base64_image)
                             st.image(
                                 image,
-                                caption=f"Generated Image: {user_prompt[:50]}...",
+                                caption=f"Generated Image: {prompt[:50]}...",
                                 use_column_width=True
                             )
-                            
+
                             # Add download button for the generated image
                             st.download_button(
                                 label="Download Image",
                                 data=image.getvalue(),
-                                file_name="generated_image.png",
-                                mime="image/png"
+                                file_name=f"generated_image_{i}.png",
+                                mime="image/png",
+                                key=f"download_button_{i}"
                             )
                         except ValueError as e:
                             st.error(f"Failed to process the generated image: {str(e)}")
@@ -1,13 +1,25 @@
-import base64
+import hashlib
 import io
-import json
-import os
 import boto3
+import orjson
+import pybase64
 import streamlit as st
 from PIL import Image
+from botocore.config import Config
 
 REGION = "us-east-1"
 
+# Decode chunk size in base64 characters; must be a multiple of 4
+B64_CHUNK_SIZE = 64 * 1024
+
+# Fixed generation parameters for Nova variations, built once per module
+IMAGE_GENERATION_CONFIG = {
+    "numberOfImages": 1,
+    "height": 512,
+    "width": 512,
+    "cfgScale": 8.0,
+}
+
 # Define bedrock
 @st.cache_resource
 def get_bedrock_client():
@@ -15,41 +27,70 @@ def get_bedrock_client():
     return boto3.client(
         service_name="bedrock-runtime",
         region_name=REGION,
+        config=Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 3},
+        ),
     )
 
-def image_to_base64(img) -> str:
-    """Convert a PIL Image or local image file path to a base64 string for Amazon Bedrock"""
-    if isinstance(img, str):
-        if os.path.isfile(img):
-            print(f"Reading image from file: {img}")
-            with open(img, "rb") as f:
-                return base64.b64encode(f.read()).decode("utf-8")
-        else:
-            raise FileNotFoundError(f"File {img} does not exist")
-    elif isinstance(img, Image.Image):
-        print("Converting PIL Image to base64 string")
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
-    else:
-        raise ValueError(f"Expected str (filename) or PIL Image. Got {type(img)}")
+# Module-level client reference: steady-state calls do one attribute load
+# instead of taking Streamlit's cache lock on every invocation
+_CLIENT = None
+
+def _bedrock():
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = get_bedrock_client()
+    return _CLIENT
+
+def uploaded_to_b64(uploaded_file) -> str:
+    """
+    Base64-encode an uploaded file's original bytes for Amazon Bedrock.
+    Uses the bytes Streamlit already holds, skipping the PNG re-encode a
+    PIL round-trip would cost.
+    Args:
+        uploaded_file: Streamlit UploadedFile handle
+    Returns:
+        str: Base64 string of the uploaded image
+    """
+    return pybase64.b64encode(uploaded_file.getvalue()).decode("ascii")
 
 def base64_to_pil(base64_string):
     """
-    Convert a base64 string to a PIL Image
+    Convert a base64 string to a PIL Image.
+    Decodes in chunks straight into the image buffer so no intermediate
+    full-size bytes object is allocated alongside the result.
     Args:
         base64_string: base64 string of image
     Returns:
         PIL.Image: The decoded image
     """
     try:
-        imgdata = base64.b64decode(base64_string)
-        image = Image.open(io.BytesIO(imgdata))
+        buffer = io.BytesIO()
+        for i in range(0, len(base64_string), B64_CHUNK_SIZE):
+            buffer.write(pybase64.b64decode(base64_string[i:i + B64_CHUNK_SIZE], validate=False))
+        buffer.seek(0)
+        image = Image.open(buffer)
+        # Force the decode here so corrupt data errors in this try block
+        # instead of later inside Streamlit's renderer
+        image.load()
         return image
     except Exception as e:
         st.error(f"Error converting base64 to image: {str(e)}")
         return None
 
+# Hash multi-MB base64 strings with blake2b instead of Streamlit's default,
+# which is slow on large values; short strings stay as their own key
+def _hash_large_str(s: str):
+    if len(s) > 10000:
+        return hashlib.blake2b(s.encode(), digest_size=16).hexdigest()
+    return s
+
+# Nova runs with a fixed cfgScale/size here, so identical inputs yield the
+# same variation; caching skips the paid Bedrock call on Streamlit reruns.
+# Errors raise through to the pipeline and are never cached.
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={str: _hash_large_str})
 def nova_update_image(change_prompt, init_image_b64, similarity_strength=0.7):
     """
     Use Bedrock API to generate an Image variation using Nova
@@ -60,41 +101,32 @@ def nova_update_image(change_prompt, init_image_b64, similarity_strength=0.7):
     Returns:
         str: Base64 string of generated image
     """
-    try:
-        body = {
-            "taskType": "IMAGE_VARIATION",
-            "imageVariationParams": {
-                "text": change_prompt,
-                "images": [init_image_b64],
-                "similarityStrength": similarity_strength,
-            },
-            "imageGenerationConfig": {
-                "numberOfImages": 1,
-                "height": 512,
-                "width": 512,
-                "cfgScale": 8.0,
-            },
-        }
-
-        bedrock_runtime = get_bedrock_client()
-        response = bedrock_runtime.invoke_model(
-            body=json.dumps(body),
-            modelId="amazon.nova-canvas-v1:0",
-            accept="application/json",
-            contentType="application/json"
-        )
-        
-        response_body = json.loads(response.get("body").read())
-        return response_body.get("images")[0]
-    except Exception as e:
-        st.error(f"Error generating image: {str(e)}")
-        return None
+    body = {
+        "taskType": "IMAGE_VARIATION",
+        "imageVariationParams": {
+            "text": change_prompt,
+            "images": [init_image_b64],
+            "similarityStrength": similarity_strength,
+        },
+        "imageGenerationConfig": IMAGE_GENERATION_CONFIG,
+    }
+
+    bedrock_runtime = _bedrock()
+    response = bedrock_runtime.invoke_model(
+        body=orjson.dumps(body),
+        modelId="amazon.nova-canvas-v1:0",
+        accept="application/json",
+        contentType="application/json"
+    )
+
+    response_body = orjson.loads(response.get("body").read())
+    return response_body.get("images")[0]
 
 def update_image_pipeline(user_image, change_prompt, model, similarity_strength=0.7):
     """
     Complete pipeline for updating an image
     Args:
-        user_image: PIL Image object
+        user_image: Streamlit UploadedFile handle
         change_prompt: Text prompt for modification
         model: Model name to use
         similarity_strength: Similarity strength for Nova
@@ -102,7 +134,7 @@ def update_image_pipeline(user_image, change_prompt, model, similarity_strength=
         PIL.Image: Modified image
     """
     try:
-        init_image_b64 = image_to_base64(user_image)
+        init_image_b64 = uploaded_to_b64(user_image)
         
         if model == "Amazon Nova":
             updated_image_b64 = nova_update_image(
@@ -146,8 +178,10 @@ def main():
 
     # Show user image and generate button in first column
     if user_image is not None:
-        user_image = Image.open(user_image)
-        col1.image(user_image, caption="Original Image")
+        # PIL is only needed for the preview; the original upload bytes
+        # are what gets submitted to Bedrock
+        preview_image = Image.open(user_image)
+        col1.image(preview_image, caption="Original Image")
         
         # Button to generate new image
         if col1.button("Update Image"):
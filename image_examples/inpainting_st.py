@@ -1,11 +1,12 @@
-import base64
 import io
 import json
 import os
 
 import boto3
+import pybase64
 import streamlit as st
 from PIL import Image, ImageOps
+from botocore.config import Config
 
 REGION = "us-west-2"
 
@@ -13,6 +14,11 @@ REGION = "us-west-2"
 bedrock_runtime = boto3.client(
     service_name="bedrock-runtime",
     region_name=REGION,
+    config=Config(
+        max_pool_connections=64,
+        tcp_keepalive=True,
+        retries={"mode": "adaptive", "max_attempts": 3},
+    ),
 )
 
 
@@ -49,14 +55,14 @@ def image_to_base64(img) -> str:
         if os.path.isfile(img):
             print(f"Reading image from file: {img}")
             with open(img, "rb") as f:
-                return base64.b64encode(f.read()).decode("utf-8")
+                return pybase64.b64encode(f.read()).decode("utf-8")
         else:
             raise FileNotFoundError(f"File {img} does not exist")
     elif isinstance(img, Image.Image):
         print("Converting PIL Image to base64 string")
         buffer = io.BytesIO()
         img.save(buffer, format="PNG")
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return pybase64.b64encode(buffer.getvalue()).decode("utf-8")
     else:
         raise ValueError(f"Expected str (filename) or PIL Image. Got {type(img)}")
 
@@ -72,8 +78,11 @@ def base64_to_pil(base64_string):
         image: PIL image
     """
 
-    imgdata = base64.b64decode(base64_string)
+    imgdata = pybase64.b64decode(base64_string, validate=False)
     image = Image.open(io.BytesIO(imgdata))
+    # Force the decode here so corrupt data errors eagerly rather than
+    # during rendering
+    image.load()
     return image
 
 
@@ -1,11 +1,22 @@
-import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import boto3
-from typing import List, Dict, Any, Optional
+from botocore.config import Config
+from typing import List, Dict, Any, Iterator, Optional
 
 # Constants
 DEFAULT_TEMPERATURE = 0.5
 DEFAULT_REGION = "us-east-1"
 
+# Constant request fragments, built once instead of per call
+INFERENCE_CONFIG = {"temperature": DEFAULT_TEMPERATURE}
+SUMMARIZE_SYSTEM_PROMPTS = [
+    {"text": "You are an app that creates summaries of text in 50 words or less."}
+]
+SENTIMENT_SYSTEM_PROMPTS = [{
+    "text": "You are a bot that takes text and returns a JSON object of sentiment analysis."
+}]
+
 # Available model IDs
 model_ids = [
     "us.anthropic.claude-3-5-sonnet-20241022-v2:0",
@@ -19,15 +30,24 @@ model_ids = [
     "us.amazon.nova-micro-v1:0",
 ]
 
-# Setup bedrock client at module level
-try:
-    bedrock_runtime = boto3.client(
+# Build the client lazily so importing this module doesn't pay TLS and
+# credential resolution; the singleton is created on first Bedrock call
+@functools.cache
+def get_bedrock_client():
+    """
+    Create and cache the Bedrock runtime client.
+
+    Returns:
+        boto3.client: Bedrock runtime client singleton.
+    """
+    return boto3.client(
         service_name="bedrock-runtime",
         region_name=DEFAULT_REGION,
+        config=Config(
+            max_pool_connections=64,
+            retries={"mode": "adaptive", "max_attempts": 5},
+        ),
     )
-except Exception as e:
-    print(f"Error initializing Bedrock client: {str(e)}")
-    raise
 
 def validate_model_id(model_id: str) -> None:
     """
@@ -42,50 +62,84 @@ def validate_model_id(model_id: str) -> None:
     if model_id not in model_ids:
         raise ValueError(f"Invalid model ID: {model_id}")
 
-def generate_conversation(
+def generate_conversation_stream(
     model_id: str,
     system_prompts: List[Dict[str, str]],
     messages: List[Dict[str, Any]]
-) -> str:
+) -> Iterator[str]:
     """
-    Sends messages to a model and returns the generated response.
-    
+    Sends messages to a model and yields the response text as it streams.
+
+    Using converse_stream means the first tokens arrive after roughly
+    first-token latency instead of waiting for the full completion, so
+    callers (e.g. st.write_stream) can render progressively.
+
     Args:
         model_id (str): The model ID to use.
         system_prompts (List[Dict[str, str]]): The system prompts for the model.
         messages (List[Dict[str, Any]]): The messages to send to the model.
-        
-    Returns:
-        str: The conversation response from the model.
-        
+
+    Yields:
+        str: Text chunks in generation order.
+
     Raises:
         Exception: If there's an error during conversation generation.
     """
     try:
         print(f"Generating message with model {model_id}")
-        
-        inference_config = {"temperature": DEFAULT_TEMPERATURE}
-        
-        response = bedrock_runtime.converse(
+
+        response = get_bedrock_client().converse_stream(
             modelId=model_id,
             messages=messages,
             system=system_prompts,
-            inferenceConfig=inference_config,
+            inferenceConfig=INFERENCE_CONFIG,
         )
-        
-        # Log token usage
-        token_usage = response.get("usage", {})
-        print(f"Input tokens: {token_usage.get('inputTokens', 0)}")
-        print(f"Output tokens: {token_usage.get('outputTokens', 0)}")
-        print(f"Total tokens: {token_usage.get('totalTokens', 0)}")
-        print(f"Stop reason: {response.get('stopReason', 'Unknown')}")
-        
-        return response.get("output", {}).get("message", {}).get("content", [{}])[0].get("text", "")
-        
+
+        for event in response.get("stream", []):
+            delta = event.get("contentBlockDelta")
+            if delta:
+                yield delta.get("delta", {}).get("text", "")
+
+            if "messageStop" in event:
+                print(f"Stop reason: {event['messageStop'].get('stopReason', 'Unknown')}")
+
+            # Token usage arrives in the trailing metadata event
+            metadata = event.get("metadata")
+            if metadata:
+                token_usage = metadata.get("usage", {})
+                print(f"Input tokens: {token_usage.get('inputTokens', 0)}")
+                print(f"Output tokens: {token_usage.get('outputTokens', 0)}")
+                print(f"Total tokens: {token_usage.get('totalTokens', 0)}")
+
     except Exception as e:
         print(f"Error generating conversation: {str(e)}")
         raise
 
+def generate_conversation(
+    model_id: str,
+    system_prompts: List[Dict[str, str]],
+    messages: List[Dict[str, Any]]
+) -> str:
+    """
+    Sends messages to a model and returns the full generated response.
+
+    Collects the streaming response; callers that want progressive output
+    should iterate generate_conversation_stream directly.
+
+    Args:
+        model_id (str): The model ID to use.
+        system_prompts (List[Dict[str, str]]): The system prompts for the model.
+        messages (List[Dict[str, Any]]): The messages to send to the model.
+
+    Returns:
+        str: The conversation response from the model.
+
+    Raises:
+        Exception: If there's an error during conversation generation.
+    """
+    return "".join(generate_conversation_stream(model_id, system_prompts, messages))
+
+@functools.lru_cache(maxsize=128)
 def summarize_text(text: str) -> str:
     """
     Summarizes the provided text using a generative AI model.
@@ -102,16 +156,14 @@ def summarize_text(text: str) -> str:
     model_id = "us.amazon.nova-pro-v1:0"
     validate_model_id(model_id)
     
-    system_prompts = [
-        {"text": "You are an app that creates summaries of text in 50 words or less."}
-    ]
     messages = [{
         "role": "user",
         "content": [{"text": f"Summarize the following text: {text}."}],
     }]
 
-    return generate_conversation(model_id, system_prompts, messages)
+    return generate_conversation(model_id, SUMMARIZE_SYSTEM_PROMPTS, messages)
 
+@functools.lru_cache(maxsize=128)
 def sentiment_analysis(text: str) -> str:
     """
     Performs sentiment analysis on the provided text.
@@ -128,16 +180,14 @@ def sentiment_analysis(text: str) -> str:
     model_id = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
     validate_model_id(model_id)
     
-    system_prompts = [{
-        "text": "You are a bot that takes text and returns a JSON object of sentiment analysis."
-    }]
     messages = [{
         "role": "user",
         "content": [{"text": text}],
     }]
 
-    return generate_conversation(model_id, system_prompts, messages)
+    return generate_conversation(model_id, SENTIMENT_SYSTEM_PROMPTS, messages)
 
+@functools.lru_cache(maxsize=128)
 def perform_qa(question: str, text: str) -> str:
     """
     Performs Q&A operation based on the provided text and question.
@@ -182,12 +232,10 @@ def main():
         print("\n=== Summarization Example ===")
         summary = summarize_text(text)
         print(f"Summary:\n{summary}")
-        time.sleep(2)
 
         print("\n=== Sentiment Analysis Example ===")
         sentiment_analysis_json = sentiment_analysis(text)
         print(f"Sentiment Analysis JSON:\n{sentiment_analysis_json}")
-        time.sleep(2)
 
         print("\n=== Q&A Example ===")
         questions = [
@@ -196,11 +244,14 @@ def main():
             "When was Amazon Bedrock announced?"
         ]
 
-        for question in questions:
+        # Each Q&A call is an independent network round-trip, so fan out
+        # and wait max(T_single) instead of sum(T_single)
+        with ThreadPoolExecutor(max_workers=len(questions)) as executor:
+            answers = list(executor.map(lambda q: perform_qa(q, text), questions))
+
+        for question, answer in zip(questions, answers):
             print(f"\nQuestion: {question}")
-            answer = perform_qa(question, text)
             print(f"Answer: {answer}")
-            time.sleep(2)
 
     except Exception as e:
         print(f"An error occurred in main: {str(e)}")